@@ -1,4 +1,5 @@
-from datetime import datetime
+import asyncio
+import time
 from aiohttp import web
 from server import PromptServer
 from .nodes import idle_detector
@@ -9,17 +10,27 @@ def setup_routes():
     @PromptServer.instance.routes.post("/idle_detector/set_active")
     async def set_active(request):
         idle_detector.set_active()
-        return web.json_response({"status": "active", "timestamp": datetime.now().isoformat()})
+        return web.json_response({"status": "active", "timestamp": int(time.time())})
 
     @PromptServer.instance.routes.post("/idle_detector/set_idle")
     async def set_idle(request):
         idle_detector.set_idle()
-        return web.json_response({"status": "idle", "timestamp": datetime.now().isoformat()})
+        return web.json_response({"status": "idle", "timestamp": int(time.time())})
 
     @PromptServer.instance.routes.get("/idle_detector/status")
     async def get_status(request):
         status_data = idle_detector.get_status_data()
-        return web.json_response(status_data)
+
+        # The status only meaningfully changes when last_active moves, so it
+        # doubles as the ETag; pollers that saw the current value get an
+        # empty 304 and derive idle duration client-side
+        etag = f'"{status_data["last_active"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        return web.Response(body=idle_detector.get_status_json(status_data),
+                            content_type='application/json',
+                            headers={"ETag": etag})
 
     @PromptServer.instance.routes.post("/idle_detector/autosave")
     async def autosave_workflow(request):
@@ -31,7 +42,9 @@ def setup_routes():
         if not workflow_data or not filename:
             return web.json_response({"status": "error", "message": "Missing workflow data or filename"}, status=400)
 
-        filepath = idle_detector.save_workflow_data(workflow_data, filename)
+        # Serializing and writing a large workflow is blocking work; run it
+        # on a worker thread so the event loop keeps serving requests
+        filepath = await asyncio.to_thread(idle_detector.save_workflow_data, workflow_data, filename)
         if filepath:
             return web.json_response({"status": "success", "message": f"Workflow saved to {filepath}"})
         else:
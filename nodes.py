@@ -1,18 +1,65 @@
+import atexit
+import hmac
 import os
 import json
+import re
 import time
 import threading
-import subprocess
-import requests
 from datetime import datetime
 from pathlib import Path
 import folder_paths
 
+# Use orjson for JSON serialization when available - it is a C implementation
+# that is several times faster than the stdlib, which matters for large
+# workflow auto-saves
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(data):
+    """Serialize data to compact JSON bytes, preferring orjson"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+# Characters allowed in workflow filenames; everything else is stripped so a
+# client-supplied name can never escape the workflows directory
+_FILENAME_UNSAFE_RE = re.compile(r'[^A-Za-z0-9._ ()-]+')
+
+# RunPod pod IDs are short lowercase alphanumeric tokens; anything else
+# (empty strings, 'unknown', placeholder values) is rejected up front
+_POD_ID_RE = re.compile(r'^[a-z0-9]{8,32}$')
+
+
+def _json_loads(raw):
+    """Parse JSON from bytes or str, preferring orjson"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 class IdleDetectorExtension:
     """
     A global extension that monitors ComfyUI idle status and automatically shuts down idle pods
     """
-    
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """Get the single extension instance, creating it on first call
+
+        Guards against a second instance (and a duplicate monitor thread)
+        if the module gets imported or reloaded more than once.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
     def __init__(self):
         # Get config root from environment or default to /root
         self.config_root = os.getenv("CONFIG_ROOT", "/root")
@@ -25,14 +72,71 @@ class IdleDetectorExtension:
         self.workflows_path = comfyui_base / "user" / "default" / "workflows"
         
         self.status_file = self.status_dir / "status"
+        self._status_tmp_file = self.status_file.with_suffix('.tmp')
         self.api_base_url = os.getenv("API_BASE_URL", "https://your-api.com")
         self.shutdown_endpoint = f"{self.api_base_url}/pods/shutdown"
+        # Built lazily by _call_refresh_idle_endpoint: the refresh-idle
+        # payload never varies, so its serialized body and signature are
+        # computed once and reused for every flush
+        self._refresh_idle_request = None
+        # The status file only exists for external pod tooling; deployments
+        # without such a consumer can set IDLE_STATUS_PERSIST=0 to keep the
+        # state purely in memory and skip the disk round-trips entirely
+        self.persist_status = os.getenv("IDLE_STATUS_PERSIST", "1") != "0"
         self.check_interval = int(os.getenv("IDLE_CHECK_INTERVAL", "30"))  # 30 seconds
         self.idle_threshold = int(os.getenv("IDLE_THRESHOLD", "900"))  # 15 minutes
         self.waiting_time = int(os.getenv("IDLE_WAITING_TIME", "3600"))  # 1 hour default
         self.user_pod_id = os.getenv("POD_ID", "unknown")
         self.monitor_thread = None
         self.running = False
+        self._monitor_lock = threading.Lock()
+
+        # In-memory activity tracking - the monitor loop blocks on this event
+        # instead of polling the status file, so an active pod does no work
+        # between user interactions
+        self._state_changed = threading.Event()
+        self._last_active_monotonic = time.monotonic()
+
+        # Status file cache - the file only changes when we write it (or an
+        # external writer touches it), so readers revalidate with a single
+        # os.stat instead of re-opening and re-parsing on every poll
+        self._status_cache = None
+        self._status_mtime_ns = 0
+        self._status_write_lock = threading.Lock()
+
+        # Debounced persistence - rapid set_active calls from the frontend
+        # only bump the in-memory timestamp; the durable write (and the
+        # refresh-idle backend call) is coalesced into one flush per second
+        self._flush_delay = 1.0
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        # When the last event/flush signal went out; lets set_active degrade
+        # to a bare timestamp store under bursts (see set_active)
+        self._last_signal_monotonic = time.monotonic() - self._flush_delay
+
+        # Resolved lazily by _get_current_pod_id and then reused
+        self._pod_id = None
+        self._warned_no_pod_id = False
+
+        # Digest of the last auto-save per filename, so re-saving an
+        # unchanged workflow skips the disk write
+        self._last_save_digests = {}
+
+        # __init__ creates the workflows directory below; re-checking it on
+        # every save is wasted I/O, so remember that it exists and only
+        # recreate it after a failed write
+        self._workflows_dir_ready = False
+
+        # Shared HTTP session so backend calls reuse one pooled connection
+        # instead of paying TCP + TLS setup per request
+        self._http_session = None
+        self._http_session_lock = threading.Lock()
+
+        # HMAC key bytes, resolved once instead of per signature
+        secret_key = os.getenv("WEBHOOK_SECRET_KEY", "")
+        self._hmac_key = secret_key.encode() if secret_key else None
+        if self._hmac_key is None:
+            print("Idle Detector: WEBHOOK_SECRET_KEY environment variable is not set")
         
         # Get Python command from environment or use default
         self.python_cmd = os.getenv("PYTHON_CMD", f"python{os.getenv('PYTHON_VERSION', '3.10')}")
@@ -65,104 +169,186 @@ class IdleDetectorExtension:
         # Initialize status file with current timestamp as last_active
         self._initialize_status_file()
         self.start_monitoring()
+        atexit.register(self._on_process_exit)
         print("Idle Detector Extension initialized and monitoring started")
 
     def _initialize_status_file(self):
         """Initialize status file with original last_active timestamp"""
-        if not self.status_file.exists():
+        if not self.persist_status or not self.status_file.exists():
+            now_ts = int(time.time())
             status_data = {
-                "last_active": datetime.now().isoformat(),
-                "initialized": datetime.now().isoformat()
+                "last_active": now_ts,
+                "initialized": now_ts
             }
-            
+
             try:
-                with open(self.status_file, 'w') as f:
-                    json.dump(status_data, f)
+                self._write_status(status_data)
                 print(f"Idle Detector: Initialized status file with timestamp: {status_data['last_active']}")
             except Exception as e:
                 print(f"Idle Detector: Error initializing status file: {e}")
 
+    def _write_status(self, status_data):
+        """Atomically write status data to disk and refresh the in-memory cache
+
+        The payload goes to a temp file in a single write() and is moved into
+        place with os.replace, so readers always see either the old or the new
+        status - never a truncated file mid-write.
+        """
+        if not self.persist_status:
+            self._status_cache = status_data
+            return
+
+        # Serialize writers: the atexit hook can run while a flush timer
+        # callback is mid-write, and two O_TRUNC writers on the same temp
+        # path would tear the payload
+        with self._status_write_lock:
+            payload = _json_dumps(status_data)
+            fd = os.open(self._status_tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(self._status_tmp_file, self.status_file)
+            self._status_cache = status_data
+            self._status_mtime_ns = os.stat(self.status_file).st_mtime_ns
+
+    def _read_status(self):
+        """Read status data, revalidating the cache with a single stat call"""
+        if not self.persist_status:
+            return self._status_cache or {}
+
+        try:
+            mtime_ns = os.stat(self.status_file).st_mtime_ns
+        except OSError:
+            return self._status_cache or {}
+
+        if self._status_cache is not None and mtime_ns == self._status_mtime_ns:
+            return self._status_cache
+
+        try:
+            with open(self.status_file, 'rb') as f:
+                self._status_cache = _json_loads(f.read())
+            self._status_mtime_ns = mtime_ns
+        except Exception as e:
+            print(f"Idle Detector: Error reading status file: {e}")
+            return self._status_cache or {}
+        return self._status_cache
+
     def _update_last_active(self):
         """Update only the last_active timestamp - called by frontend"""
-        status_data = {
-            "last_active": datetime.now().isoformat()
-        }
-        
-        # Preserve existing data if file exists
         try:
-            if self.status_file.exists():
-                with open(self.status_file, 'r') as f:
-                    existing_data = json.load(f)
-                    status_data.update(existing_data)
-                    status_data["last_active"] = datetime.now().isoformat()
-            
-            with open(self.status_file, 'w') as f:
-                json.dump(status_data, f)
-                
+            # The cache is authoritative between our own writes; only fall
+            # back to _read_status (stat + possible re-read) before the
+            # first write of the process
+            if self._status_cache is not None:
+                status_data = self._status_cache
+            else:
+                status_data = dict(self._read_status())
+
+            # Derive the epoch stamp from the monotonic activity time, so the
+            # coalescing delay between set_active and this flush does not
+            # shift what gets persisted
+            activity_age = time.monotonic() - self._last_active_monotonic
+            status_data["last_active"] = int(time.time() - activity_age)
+            self._write_status(status_data)
+
             # Call refresh-idle endpoint to update backend
             pod_id = self._get_current_pod_id()
             if pod_id and pod_id != "unknown":
                 self._call_refresh_idle_endpoint(pod_id)
-            else:
-                print("Idle Detector: No valid pod ID, skipping refresh-idle call")
-                
+            elif not self._warned_no_pod_id:
+                self._warned_no_pod_id = True
+                print("Idle Detector: No valid pod ID, skipping refresh-idle calls")
+
         except Exception as e:
             print(f"Idle Detector: Error updating last_active: {e}")
 
     def _get_last_active(self):
-        """Get the last active timestamp from file"""
+        """Get the last active time as epoch seconds"""
+        value = self._read_status().get("last_active")
+        if isinstance(value, (int, float)):
+            return value
+        if value is None:
+            return time.time()
+        # Legacy status files stored an ISO timestamp string
         try:
-            if self.status_file.exists():
-                with open(self.status_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get("last_active", datetime.now().isoformat())
-            return datetime.now().isoformat()
-        except Exception as e:
-            print(f"Idle Detector: Error reading last_active: {e}")
-            return datetime.now().isoformat()
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00').replace('+00:00', '')).timestamp()
+        except ValueError:
+            return time.time()
 
     def _get_current_pod_id(self):
-        """Get current RunPod ID using multiple fallback methods"""
-        
-        # Method 1: Check RunPod-specific environment variable
+        """Get current RunPod ID using multiple fallback methods
+
+        The ID cannot change while the pod is alive, so the first successful
+        resolution is cached and every later call returns it without touching
+        the environment or the metadata file.
+        """
+        if self._pod_id is not None:
+            return self._pod_id
+
+        self._pod_id = self._resolve_pod_id()
+        return self._pod_id
+
+    def _resolve_pod_id(self):
+        """Resolve the pod ID from the environment or RunPod metadata"""
+        # Method 1: Check RunPod-specific environment variable; the compiled
+        # pattern short-circuits before any file I/O on well-formed IDs
         runpod_pod_id = os.getenv("RUNPOD_POD_ID", "")
-        if runpod_pod_id and runpod_pod_id != "unknown":
+        if _POD_ID_RE.match(runpod_pod_id):
             print(f"Idle Detector: Found pod ID from RUNPOD_POD_ID environment variable: {runpod_pod_id}")
             return runpod_pod_id
 
-        # Method 2: Check RunPod metadata file
+        # Method 2: Check RunPod metadata file; open directly rather than
+        # stat-ing first - a missing file is the common case, not an error
         try:
-            metadata_file = Path("/runpod-volume/runpod.json")
-            if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    pod_id = metadata.get("podId")
-                    if pod_id:
-                        print(f"Idle Detector: Found pod ID from metadata file: {pod_id}")
-                        return pod_id
+            with open("/runpod-volume/runpod.json", 'r') as f:
+                metadata = json.load(f)
+            pod_id = metadata.get("podId")
+            if pod_id and _POD_ID_RE.match(str(pod_id)):
+                print(f"Idle Detector: Found pod ID from metadata file: {pod_id}")
+                return pod_id
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Idle Detector: Error reading RunPod metadata file: {e}")
-        
+
         print("Idle Detector: Could not determine pod ID, using 'unknown'")
         return "unknown"
     
-    def _get_hmac_signature(self, payload):
-        """Generate HMAC signature for secure API calls"""
-        try:
-            import hmac
-            import hashlib
-            secret_key = os.getenv("WEBHOOK_SECRET_KEY", "")
-            if not secret_key:
-                print("Idle Detector: WEBHOOK_SECRET_KEY environment variable is not set")
-                return None
+    def _sign_request(self, payload):
+        """Serialize a payload once and sign the exact bytes that get sent
 
-            message = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        Returns (body, headers). Previously the signature was computed over
+        one json.dumps of the payload while requests re-serialized it again
+        for the body, so the signed message and the wire bytes could differ;
+        sending the signed bytes directly avoids both the mismatch and the
+        double serialization.
+        """
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        headers = {"Content-Type": "application/json"}
+        if self._hmac_key is not None:
+            # hmac.digest is the one-shot C fast path - no HMAC object or
+            # incremental update machinery for a message this small
+            headers["X-Signature"] = hmac.digest(self._hmac_key, body, "sha256").hex()
+        return body, headers
 
-            signature = hmac.new(secret_key.encode(), message.encode(), hashlib.sha256).hexdigest()
-            return signature
-        except Exception as e:
-            print(f"Idle Detector: Error generating HMAC signature: {e}")
-            return None
+    def _get_http_session(self):
+        """Get the shared requests.Session, creating it on first use"""
+        with self._http_session_lock:
+            if self._http_session is None:
+                # Deferred so ComfyUI startup does not pay for importing
+                # requests; backend calls are rare and off the hot path
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # One keep-alive connection to the backend is plenty; retry
+                # transient connection failures once instead of dropping a
+                # refresh-idle on the floor
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=1)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
 
     def _call_shutdown_endpoint(self, pod_id):
         """Call the shutdown endpoint with pod ID"""
@@ -173,17 +359,12 @@ class IdleDetectorExtension:
                 "userPodId": self.user_pod_id,
                 "timestamp": int(time.time())
             }
-            headers = {"Content-Type": "application/json"}
-            
-            # Add signature if available
-            signature = self._get_hmac_signature(payload=params)
-            if signature:
-                headers["X-Signature"] = signature
-            
-            response = requests.post(
-                self.shutdown_endpoint, 
-                json=params, 
-                headers=headers, 
+            body, headers = self._sign_request(params)
+
+            response = self._get_http_session().post(
+                self.shutdown_endpoint,
+                data=body,
+                headers=headers,
                 timeout=30
             )
 
@@ -196,28 +377,28 @@ class IdleDetectorExtension:
     def _call_refresh_idle_endpoint(self, pod_id):
         """Call the refresh-idle endpoint to reset idle timer"""
         try:
-            endpoint_url = f"{self.api_base_url}/pods/{self.user_pod_id}/refresh-idle"
-            payload = {
-                "timeout": self.idle_threshold,
-                "userId": self.user_id,
-                "waitingTime": self.waiting_time
-            }
-            headers = {"Content-Type": "application/json"}
-            
-            # Add signature if available
-            signature = self._get_hmac_signature(payload=payload)
-            if signature:
-                headers["X-Signature"] = signature
-            
-            response = requests.post(
+            # The URL, body and signature are invariant for the lifetime of
+            # the process - build them on the first call and reuse
+            if self._refresh_idle_request is None:
+                endpoint_url = f"{self.api_base_url}/pods/{self.user_pod_id}/refresh-idle"
+                payload = {
+                    "timeout": self.idle_threshold,
+                    "userId": self.user_id,
+                    "waitingTime": self.waiting_time
+                }
+                body, headers = self._sign_request(payload)
+                self._refresh_idle_request = (endpoint_url, body, headers)
+
+            endpoint_url, body, headers = self._refresh_idle_request
+
+            response = self._get_http_session().post(
                 endpoint_url,
-                json=payload,
+                data=body,
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                print(f"Idle Detector: Refreshed idle timer for pod {pod_id}")
                 return True
             else:
                 print(f"Idle Detector: Failed refresh for pod {pod_id}. "
@@ -228,19 +409,45 @@ class IdleDetectorExtension:
             print(f"Idle Detector: Error calling refresh-idle endpoint: {e}")
             return False
 
+    def _check_external_activity(self):
+        """Fold an externally written last_active into the monotonic clock
+
+        _read_status revalidates with a single os.stat, so when nothing
+        touched the file this costs one syscall and no parsing. If an
+        external writer recorded more recent activity than we have in
+        memory, shift the monotonic timestamp to match.
+        """
+        if not self.persist_status:
+            return
+        last_active = self._get_last_active()
+        external_idle = max(time.time() - last_active, 0)
+        in_memory_idle = time.monotonic() - self._last_active_monotonic
+        if external_idle < in_memory_idle:
+            self._last_active_monotonic = time.monotonic() - external_idle
+
     def _monitor_loop(self):
         """Main monitoring loop that runs in background thread"""
-        print(f"Idle Detector: Starting idle monitoring loop (check every {self.check_interval}s, shutdown after {self.idle_threshold}s idle)")
-        
+        print(f"Idle Detector: Starting idle monitoring loop (shutdown after {self.idle_threshold}s idle)")
+
+        # Bind the per-iteration callables as locals so each wake-up skips
+        # the attribute lookups
+        monotonic = time.monotonic
+        clear_event = self._state_changed.clear
+        wait_event = self._state_changed.wait
+
         while self.running:
             try:
-                # Simply read the last_active timestamp from file
-                last_active_str = self._get_last_active()
-                last_active = datetime.fromisoformat(last_active_str.replace('Z', '+00:00').replace('+00:00', ''))
-                now = datetime.now()
-                
-                idle_duration = (now - last_active).total_seconds()
-                
+                clear_event()
+
+                # One stat call per wake-up catches external tooling that
+                # refreshes the status file behind our back; the file is only
+                # re-read when its mtime actually moved
+                self._check_external_activity()
+
+                # Use the in-memory monotonic timestamp as source of truth -
+                # no file read or timestamp parsing in the fast path
+                idle_duration = monotonic() - self._last_active_monotonic
+
                 if idle_duration >= self.idle_threshold:
                     print(f"Idle Detector: Pod has been idle for {idle_duration/60:.1f} minutes. Initiating shutdown...")
                     pod_id = self._get_current_pod_id()
@@ -249,18 +456,24 @@ class IdleDetectorExtension:
                     else:
                         print("Idle Detector: Failed to initiate shutdown")
                     break
-                else:
-                    print(f"Idle Detector: Pod active - last activity {idle_duration/60:.1f} minutes ago")
-                
-                time.sleep(self.check_interval)
-                
+
+                # Sleep until the idle threshold would be crossed; set_active()
+                # wakes us early so the deadline is recomputed from the new
+                # timestamp
+                remaining = self.idle_threshold - idle_duration
+                wait_event(timeout=remaining)
+
             except Exception as e:
                 print(f"Idle Detector: Error in monitoring loop: {e}")
-                time.sleep(self.check_interval)
+                # Back off on the event rather than a hard sleep, so
+                # stop_monitoring can still interrupt the wait
+                wait_event(timeout=self.check_interval)
 
     def start_monitoring(self):
-        """Start the monitoring thread"""
-        if not self.running:
+        """Start the monitoring thread (no-op if one is already running)"""
+        with self._monitor_lock:
+            if self.monitor_thread is not None and self.monitor_thread.is_alive():
+                return
             self.running = True
             self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
             self.monitor_thread.start()
@@ -269,32 +482,97 @@ class IdleDetectorExtension:
     def stop_monitoring(self):
         """Stop the monitoring thread"""
         self.running = False
+        # Wake the loop out of its wait immediately instead of letting it
+        # sleep out the remainder of the idle threshold
+        self._state_changed.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
             print("Idle Detector: Pod idle monitoring stopped")
 
-    def set_active(self):
-        """Set status to active - called by frontend"""
+    def _on_process_exit(self):
+        """Stop the monitor and persist any pending activity at interpreter exit
+
+        Runs via atexit when ComfyUI shuts down: wake the monitor out of its
+        wait so it exits promptly, and if a coalesced flush was still
+        pending, write the timestamp directly (skipping the backend call -
+        no 30s HTTP timeout during shutdown).
+        """
+        self.running = False
+        self._state_changed.set()
+
+        with self._flush_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+            try:
+                activity_age = time.monotonic() - self._last_active_monotonic
+                status_data = dict(self._status_cache or {})
+                status_data["last_active"] = int(time.time() - activity_age)
+                self._write_status(status_data)
+            except Exception as e:
+                print(f"Idle Detector: Error persisting status at exit: {e}")
+
+    def _schedule_flush(self):
+        """Arm the coalescing timer that persists the active timestamp
+
+        If a flush is already pending, leave it alone: cancelling and
+        re-arming on every call would let sustained sub-second activity
+        postpone the flush forever, starving the backend refresh-idle call.
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self._flush_delay, self._run_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _run_flush(self):
+        """Timer callback: clear the pending marker, then persist"""
+        with self._flush_lock:
+            self._flush_timer = None
         self._update_last_active()
 
+    def set_active(self):
+        """Set status to active - called by frontend
+
+        Only the in-memory monotonic timestamp is updated here, so the API
+        handler returns immediately; the disk write and refresh-idle call
+        happen on the debounce timer thread. Within a flush window, repeat
+        calls degrade further to a bare timestamp store - no event signal
+        and no timer interaction. The monitor re-reads the timestamp when
+        its wait times out, so a deadline computed up to one window early
+        only causes a recheck, never a premature shutdown.
+        """
+        now = time.monotonic()
+        self._last_active_monotonic = now
+        if now - self._last_signal_monotonic < self._flush_delay:
+            return
+        self._last_signal_monotonic = now
+        self._state_changed.set()
+        self._schedule_flush()
+
     def set_idle(self):
         """Set status to idle - called by frontend (not used in simplified approach)"""
         pass  # No longer needed - backend determines idle based on time
 
     def get_status_data(self):
         """Get current status data"""
-        last_active_str = self._get_last_active()
-        last_active = datetime.fromisoformat(last_active_str.replace('Z', '+00:00').replace('+00:00', ''))
-        now = datetime.now()
-        idle_duration = (now - last_active).total_seconds()
-        
+        last_active = self._get_last_active()
+        idle_duration = time.time() - last_active
+
         return {
-            "last_active": last_active_str,
+            "last_active": last_active,
             "idle_duration_seconds": idle_duration,
             "idle_threshold_seconds": self.idle_threshold,
             "is_idle": idle_duration >= self.idle_threshold
         }
 
+    def get_status_json(self, status_data=None):
+        """Get current status data pre-serialized as JSON bytes"""
+        if status_data is None:
+            status_data = self.get_status_data()
+        return _json_dumps(status_data)
+
     def save_workflow_data(self, data, filename):
         """Saves workflow data to the workflows directory."""
         if not filename:
@@ -302,24 +580,56 @@ class IdleDetectorExtension:
             return None
 
         try:
-            # Sanitize filename to ensure it's just a name and not a path
-            base_filename = os.path.basename(filename)
+            # Sanitize filename with the precompiled pattern: keep only the
+            # final path component, strip unsafe characters and leading dots
+            # so the result can never be a path or a hidden file
+            base_filename = filename.replace('\\', '/').rsplit('/', 1)[-1]
+            base_filename = _FILENAME_UNSAFE_RE.sub('', base_filename).lstrip('.')
+            if not base_filename:
+                print(f"Idle Detector: Error: Unusable filename for auto-save: {filename!r}")
+                return None
             if not base_filename.endswith('.json'):
                 base_filename += '.json'
             
             filepath = self.workflows_path / base_filename
-            
-            # Ensure the parent directory exists
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            filepath_str = str(filepath)
+
+            # Ensure the parent directory exists (only re-checked after a
+            # failed save; see _workflows_dir_ready)
+            if not self._workflows_dir_ready:
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                self._workflows_dir_ready = True
+
+            # Serialize to one contiguous buffer and write it with a single
+            # syscall; os.replace keeps the previous save intact if the
+            # process dies mid-write
+            payload = _json_dumps(data)
+
+            # The frontend re-sends the workflow after every pause in
+            # activity whether or not it changed; when the bytes match the
+            # last save of this file, there is nothing to write
+            digest = hash(payload)
+            if (self._last_save_digests.get(base_filename) == digest
+                    and os.path.exists(filepath_str)):
+                return filepath_str
+
+            tmp_file = filepath.with_name(filepath.name + '.tmp')
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, filepath)
+            self._last_save_digests[base_filename] = digest
             print(f"Idle Detector: Workflow auto-saved to {filepath}")
-            return str(filepath)
+            return filepath_str
         except Exception as e:
             print(f"Idle Detector: Error during workflow auto-save: {e}")
+            # The directory may have been removed out from under us; make
+            # the next save re-create it
+            self._workflows_dir_ready = False
             return None
 
 
 # Global extension instance
-idle_detector = IdleDetectorExtension()
+idle_detector = IdleDetectorExtension.instance()